@@ -1624,13 +1624,23 @@ class ContainerManager:
                 asyncio.open_unix_connection(socket_path), timeout=config.timeout
             )
 
-            # Send ping message
-            ping_message = '{"command": "ping", "data": {}}\n'
-            writer.write(ping_message.encode())
+            # Send a ping framed like every other socket message: a 4-byte
+            # big-endian length followed by the JSON body
+            ping_message = b'{"command": "ping", "data": {}}'
+            writer.write(len(ping_message).to_bytes(4, byteorder="big") + ping_message)
             await writer.drain()
 
             # Read response
-            response = await asyncio.wait_for(reader.readline(), timeout=config.timeout)
+            try:
+                length_bytes = await asyncio.wait_for(
+                    reader.readexactly(4), timeout=config.timeout
+                )
+                response = await asyncio.wait_for(
+                    reader.readexactly(int.from_bytes(length_bytes, byteorder="big")),
+                    timeout=config.timeout,
+                )
+            except asyncio.IncompleteReadError:
+                response = b""
 
             writer.close()
             await writer.wait_closed()
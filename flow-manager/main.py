@@ -36,7 +36,12 @@ class FlowManagerApp:
         )
         self.sensivity_filter = SensivityFilter()
         self.user_logger = UserActivityLogger(
-            self.messaging, sensivity_filter=self.sensivity_filter
+            self.messaging,
+            sensivity_filter=self.sensivity_filter,
+            batch_size=int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "64")),
+            flush_interval=float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "0.05")),
+            dedup_window=float(os.getenv("ACTIVITY_LOG_DEDUP_WINDOW", "1.0")),
+            logger=SystemLogger("user_activity_logger"),
         )
         self.event_handler = EventHandler(
             messaging=self.messaging,
@@ -82,6 +87,7 @@ class FlowManagerApp:
 
         await self.container_manager.stop_monitoring()
         await self.socket_handler.close_all_connections()
+        await self.user_logger.aclose()
         await self.messaging.close()
 
         self.logger.debug("Flow Manager application shutdown complete", {})
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
 
 from system_logger import SystemLogger
 
@@ -22,6 +23,16 @@ class Messaging(ABC):
         correlation_id: Optional[str] = None,
     ) -> None: ...
 
+    async def publish_events(
+        self,
+        event_name: str,
+        payloads: List[Dict[str, Any]],
+        routing_key: Optional[str] = None,
+    ) -> None:
+        """Publish a batch of events; backends may override to pipeline them."""
+        for payload in payloads:
+            await self.publish_event(event_name, payload, routing_key=routing_key)
+
     @abstractmethod
     async def publish_response(
         self,
@@ -41,11 +52,15 @@ class Messaging(ABC):
 class InMemoryMessaging(Messaging):
     """
     Simple in-memory messaging backend for tests and local dev without a broker.
+
+    Published events are kept in a bounded buffer; ``last_by_type`` holds the
+    latest payload per payload ``type`` (or event name when there is none).
     """
 
-    def __init__(self, logger: SystemLogger):
+    def __init__(self, logger: SystemLogger, max_events: int = 1024):
         self.logger = logger
-        self.published_events: List[Dict[str, Any]] = []
+        self.published_events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.last_by_type: Dict[str, Dict[str, Any]] = {}
         self.published_responses: List[Dict[str, Any]] = []
         self._handler: Optional[CommandHandler] = None
         self._closed = False
@@ -72,6 +87,7 @@ class InMemoryMessaging(Messaging):
                 "correlation_id": correlation_id,
             }
         )
+        self.last_by_type[payload.get("type", event_name)] = payload
         self.logger.debug(
             "InMemoryMessaging publish_event",
             {"event": event_name, "routing_key": routing_key},
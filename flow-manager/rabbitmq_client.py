@@ -1,12 +1,16 @@
+import asyncio
 import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import aio_pika
 
 from messaging import CommandHandler, Messaging
 from system_logger import SystemLogger
 
+# Compact separators keep the C encoder path and trim every message body
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
 
 class RabbitMQMessaging(Messaging):
     def __init__(
@@ -123,7 +127,7 @@ class RabbitMQMessaging(Messaging):
             raise RuntimeError("Channel not initialized for publishing responses")
 
         message = aio_pika.Message(
-            body=json.dumps(payload).encode("utf-8"),
+            body=self._serialize_payload(payload),
             correlation_id=correlation_id,
             content_type="application/json",
         )
@@ -149,7 +153,7 @@ class RabbitMQMessaging(Messaging):
             raise RuntimeError("Event exchange not initialized")
 
         message = aio_pika.Message(
-            body=json.dumps(payload).encode("utf-8"),
+            body=self._serialize_payload(payload),
             correlation_id=correlation_id,
             content_type="application/json",
         )
@@ -164,6 +168,38 @@ class RabbitMQMessaging(Messaging):
             },
         )
 
+    async def publish_events(
+        self,
+        event_name: str,
+        payloads: List[Dict[str, Any]],
+        routing_key: Optional[str] = None,
+    ) -> None:
+        """Publish a batch of events, waiting for all broker confirms at once."""
+        if not self.event_exchange:
+            raise RuntimeError("Event exchange not initialized")
+
+        routing_key = routing_key or f"event.{event_name}"
+        await asyncio.gather(
+            *(
+                self.event_exchange.publish(
+                    aio_pika.Message(
+                        body=self._serialize_payload(payload),
+                        content_type="application/json",
+                    ),
+                    routing_key=routing_key,
+                )
+                for payload in payloads
+            )
+        )
+        self.logger.debug(
+            "Published events",
+            {
+                "event": event_name,
+                "routing_key": routing_key,
+                "count": len(payloads),
+            },
+        )
+
     async def close(self) -> None:
         """Close channel and connection."""
         await self.stop_consuming()
@@ -173,6 +209,11 @@ class RabbitMQMessaging(Messaging):
             await self.connection.close()
         self.logger.debug("RabbitMQ connection closed", {})
 
+    @staticmethod
+    def _serialize_payload(payload: Dict[str, Any]) -> bytes:
+        """Encode a payload as compact UTF-8 JSON."""
+        return _json_encoder.encode(payload).encode("utf-8")
+
     def _deserialize_message(
         self, message: aio_pika.IncomingMessage
     ) -> Optional[Dict[str, Any]]:
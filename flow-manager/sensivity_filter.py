@@ -1,34 +1,40 @@
-from typing import Any, Optional, Set
-
-EXACT_SENSITIVE_KEYS = {
-    "password",
-    "passwd",
-    "pwd",
-    "secret",
-    "token",
-    "auth",
-    "authorization",
-    "credential",
-    "private",
-    "session",
-    "cookie",
-    "jwt",
-    "bearer",
-}
-
-SENSITIVE_KEY_PATTERNS = {
-    "api_key",
-    "access_token",
-    "refresh_token",
-    "private_key",
-    "secret_key",
-    "auth_token",
-    "session_token",
-    "bearer_token",
-    "jwt_token",
-}
-
-SENSITIVE_TEXT_PATTERNS = [
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, Set, Tuple
+
+EXACT_SENSITIVE_KEYS = frozenset(
+    {
+        "password",
+        "passwd",
+        "pwd",
+        "secret",
+        "token",
+        "auth",
+        "authorization",
+        "credential",
+        "private",
+        "session",
+        "cookie",
+        "jwt",
+        "bearer",
+    }
+)
+
+SENSITIVE_KEY_PATTERNS = frozenset(
+    {
+        "api_key",
+        "access_token",
+        "refresh_token",
+        "private_key",
+        "secret_key",
+        "auth_token",
+        "session_token",
+        "bearer_token",
+        "jwt_token",
+    }
+)
+
+SENSITIVE_TEXT_PATTERNS = (
     "password=",
     "token=",
     "key=",
@@ -38,7 +44,24 @@ SENSITIVE_TEXT_PATTERNS = [
     "Basic ",
     "jwt:",
     "api_key:",
-]
+)
+
+MAX_FILTER_DEPTH = 512
+
+
+def _compile_alternation(
+    exact: Iterable[str] = (), substrings: Iterable[str] = ()
+) -> "re.Pattern[str]":
+    """Compile whole-string and substring literals into one case-insensitive regex."""
+    parts = []
+    exact_alternation = "|".join(map(re.escape, exact))
+    if exact_alternation:
+        parts.append(rf"\A(?:{exact_alternation})\Z")
+    substring_alternation = "|".join(map(re.escape, substrings))
+    if substring_alternation:
+        parts.append(substring_alternation)
+    # (?!) never matches, so an empty configuration flags nothing
+    return re.compile("|".join(parts) or "(?!)", re.IGNORECASE)
 
 
 class SensivityFilter:
@@ -51,56 +74,94 @@ class SensivityFilter:
         self.exact_sensitive_keys = exact_sensitive_keys
         self.sensitive_key_patterns = sensitive_key_patterns
         self.sensitive_text_patterns = sensitive_text_patterns
-
-    def __call__(self, data: Any, _seen: Optional[Set[int]] = None) -> Any:
-        if data is None:
-            return None
-
-        if _seen is None:
-            _seen = set()
-
-        data_id = id(data)
-        if data_id in _seen:
-            return "[CIRCULAR_REFERENCE]"
-
-        try:
-            if isinstance(data, dict):
-                _seen.add(data_id)
-                filtered = {}
-                for key, value in data.items():
-                    if self.check_key(key) and not isinstance(value, (dict, list)):
-                        filtered[key] = "[FILTERED]"
-                    else:
-                        filtered[key] = self.__call__(value, _seen)
-                _seen.remove(data_id)
-                return filtered
-
-            elif isinstance(data, list):
-                _seen.add(data_id)
-                result = [self.__call__(item, _seen) for item in data]
-                _seen.remove(data_id)
-                return result
-
-            elif isinstance(data, str):
-                if self.check_text(data):
-                    return "[FILTERED]"
-                return data
-
-            else:
-                return data
-
-        except (RecursionError, RuntimeError):
-            return "[RECURSION_ERROR]"
+        self._key_regex = _compile_alternation(
+            exact_sensitive_keys, sensitive_key_patterns
+        )
+        self._text_regex = _compile_alternation(substrings=sensitive_text_patterns)
+        # The same handful of keys shows up in every payload; the cache lives
+        # on the instance because the patterns are configurable per filter
+        self._check_key_cached = lru_cache(maxsize=1024)(self._match_key)
+
+    def __call__(self, data: Any) -> Any:
+        return self.filter_with_flag(data)[0]
+
+    def filter_with_flag(self, data: Any) -> Tuple[Any, bool]:
+        """Filter ``data`` and report whether it contained sensitive data.
+
+        Equivalent to ``(self(data), self.check_data(data))`` in a single walk.
+        Containers are walked with an explicit stack: each dict or list gets an
+        empty shell in the output that is filled in when it is popped.
+        """
+        if not isinstance(data, (dict, list)):
+            return self._filter_leaf(data)
+
+        if isinstance(data, dict) and self._is_flat_and_clean(data):
+            return dict(data), False
+
+        sensitive = False
+        root = {} if isinstance(data, dict) else [None] * len(data)
+        # Ancestors of the container being walked; an exit marker removes each
+        # one again once all of its descendants have been filled in
+        seen: Set[int] = set()
+        stack: List[Tuple[Any, Any, int]] = [(data, root, 0)]
+        while stack:
+            source, target, depth = stack.pop()
+            if target is None:
+                # Every descendant has been filled in, leave this ancestor
+                seen.discard(source)
+                continue
+
+            seen.add(id(source))
+            stack.append((id(source), None, depth))
+
+            is_dict = isinstance(source, dict)
+            for key, value in source.items() if is_dict else enumerate(source):
+                is_container = isinstance(value, (dict, list))
+                if is_dict and self.check_key(key):
+                    sensitive = True
+                    if not is_container:
+                        target[key] = "[FILTERED]"
+                        continue
+
+                if not is_container:
+                    target[key], value_sensitive = self._filter_leaf(value)
+                    sensitive = sensitive or value_sensitive
+                elif id(value) in seen:
+                    target[key] = "[CIRCULAR_REFERENCE]"
+                elif depth + 1 >= MAX_FILTER_DEPTH:
+                    # Too deep to inspect, so treat it as sensitive
+                    target[key] = "[RECURSION_ERROR]"
+                    sensitive = True
+                elif isinstance(value, dict) and self._is_flat_and_clean(value):
+                    target[key] = dict(value)
+                else:
+                    shell = {} if isinstance(value, dict) else [None] * len(value)
+                    target[key] = shell
+                    stack.append((value, shell, depth + 1))
+
+        return root, sensitive
+
+    def _filter_leaf(self, data: Any) -> Tuple[Any, bool]:
+        if isinstance(data, str) and self.check_text(data):
+            return "[FILTERED]", True
+        return data, False
+
+    def _is_flat_and_clean(self, data: dict) -> bool:
+        for key, value in data.items():
+            if isinstance(value, (dict, list)) or self.check_key(key):
+                return False
+            if isinstance(value, str) and self.check_text(value):
+                return False
+        return True
 
     def check_key(self, key: str) -> bool:
-        return key.lower() in self.exact_sensitive_keys or any(
-            pattern in key.lower() for pattern in self.sensitive_key_patterns
-        )
+        return self._check_key_cached(key)
+
+    def _match_key(self, key: str) -> bool:
+        return self._key_regex.search(key) is not None
 
     def check_text(self, text: str) -> bool:
-        return any(
-            pattern.lower() in text.lower() for pattern in self.sensitive_text_patterns
-        )
+        return self._text_regex.search(text) is not None
 
     def check_data(self, data: Any) -> bool:
         if isinstance(data, dict):
@@ -6,13 +6,31 @@ import tempfile
 import pytest
 from unittest.mock import Mock, patch
 
-from container_manager import ContainerManager
 from messaging import InMemoryMessaging
 from socket_communication_handler import SocketCommunicationHandler
 from system_logger import SystemLogger
 from user_activity_logger import UserActivityLogger
 
 
+class NullLogger:
+    """No-op stand-in for SystemLogger where tests never assert on logging."""
+
+    def container_operation(self, operation, container_id, details):
+        pass
+
+    def communication(self, container_id, direction, message):
+        pass
+
+    def error(self, error, context):
+        pass
+
+    def state_change(self, container_id, old_state, new_state):
+        pass
+
+    def debug(self, message, context):
+        pass
+
+
 @pytest.fixture
 def mock_docker_client():
     """Create a mock Docker client for testing."""
@@ -25,6 +43,9 @@ def mock_docker_client():
 @pytest.fixture
 def container_manager(mock_docker_client):
     """Create a ContainerManager instance with mocked Docker client."""
+    # Import here so tests that don't need Docker skip the docker SDK import
+    from container_manager import ContainerManager
+
     with patch("docker.from_env", return_value=mock_docker_client):
         manager = ContainerManager()
         manager.docker_client = mock_docker_client
@@ -61,6 +82,12 @@ def mock_logger():
     return Mock(spec=SystemLogger)
 
 
+@pytest.fixture
+def null_logger():
+    """Create a no-op system logger."""
+    return NullLogger()
+
+
 @pytest.fixture
 def socket_handler(temp_socket_dir, mock_logger):
     """Create SocketCommunicationHandler instance."""
@@ -68,9 +95,9 @@ def socket_handler(temp_socket_dir, mock_logger):
 
 
 @pytest.fixture
-def messaging(mock_logger):
+def messaging(null_logger):
     """In-memory messaging backend for tests."""
-    return InMemoryMessaging(logger=mock_logger)
+    return InMemoryMessaging(logger=null_logger)
 
 
 @pytest.fixture
@@ -1,6 +1,29 @@
 import pytest
 
-from sensivity_filter import SensivityFilter
+from sensivity_filter import MAX_FILTER_DEPTH, SensivityFilter
+
+SENSITIVE_KEYS = (
+    "password",
+    "PASSWORD",
+    "api_key",
+    "API_KEY",
+    "secret",
+    "token",
+    "auth",
+)
+NORMAL_KEYS = ("username", "email", "name", "status", "data")
+
+SENSITIVE_TEXTS = (
+    "password=secret123",
+    "Bearer token123",
+    "api_key:abc123",
+    "Authorization: Basic dXNlcjpwYXNz",
+)
+NORMAL_TEXTS = (
+    "This is a normal message",
+    "Container started successfully",
+    "Status: running",
+)
 
 
 @pytest.fixture
@@ -57,42 +80,21 @@ class TestSensitiveDataFiltering:
         assert filtered_sensitive == "[FILTERED]"
         assert filtered_normal == "This is a normal message"
 
-    def test_check_key(self, sensitive_filter):
-        sensitive_keys = [
-            "password",
-            "PASSWORD",
-            "api_key",
-            "API_KEY",
-            "secret",
-            "token",
-            "auth",
-        ]
-        normal_keys = ["username", "email", "name", "status", "data"]
-
-        for key in sensitive_keys:
-            assert sensitive_filter.check_key(key) is True
+    @pytest.mark.parametrize("key", SENSITIVE_KEYS)
+    def test_check_key_sensitive(self, sensitive_filter, key):
+        assert sensitive_filter.check_key(key) is True
 
-        for key in normal_keys:
-            assert sensitive_filter.check_key(key) is False
+    @pytest.mark.parametrize("key", NORMAL_KEYS)
+    def test_check_key_normal(self, sensitive_filter, key):
+        assert sensitive_filter.check_key(key) is False
 
-    def test_check_text(self, sensitive_filter):
-        sensitive_texts = [
-            "password=secret123",
-            "Bearer token123",
-            "api_key:abc123",
-            "Authorization: Basic dXNlcjpwYXNz",
-        ]
-        normal_texts = [
-            "This is a normal message",
-            "Container started successfully",
-            "Status: running",
-        ]
+    @pytest.mark.parametrize("text", SENSITIVE_TEXTS)
+    def test_check_text_sensitive(self, sensitive_filter, text):
+        assert sensitive_filter.check_text(text) is True
 
-        for text in sensitive_texts:
-            assert sensitive_filter.check_text(text) is True
-
-        for text in normal_texts:
-            assert sensitive_filter.check_text(text) is False
+    @pytest.mark.parametrize("text", NORMAL_TEXTS)
+    def test_check_text_normal(self, sensitive_filter, text):
+        assert sensitive_filter.check_text(text) is False
 
     def test_check_data(self, sensitive_filter):
         sensitive_data = {
@@ -103,3 +105,75 @@ class TestSensitiveDataFiltering:
 
         assert sensitive_filter.check_data(sensitive_data) is True
         assert sensitive_filter.check_data(normal_data) is False
+
+    def test_filter_with_flag_matches_separate_passes(self, sensitive_filter):
+        samples = [
+            {"config": {"password": "secret"}, "status": "running"},
+            {"secrets": {"nested": "value"}, "items": ["Bearer abc", "ok"]},
+            {"status": "running", "message": "Container started"},
+            ["plain", {"name": "web"}],
+            "token=abc",
+            42,
+        ]
+
+        for data in samples:
+            assert sensitive_filter.filter_with_flag(data) == (
+                sensitive_filter(data),
+                sensitive_filter.check_data(data),
+            )
+
+    def test_flat_clean_dict_is_copied(self, sensitive_filter):
+        data = {"container_id": "abc", "status": "running", "ready": True}
+
+        filtered = sensitive_filter(data)
+
+        assert filtered == data
+        assert filtered is not data
+
+    def test_circular_reference_is_marked(self, sensitive_filter):
+        data = {"name": "web", "items": []}
+        data["items"].append(data)
+
+        filtered = sensitive_filter(data)
+
+        node = filtered
+        while isinstance(node, dict):
+            node = node["items"][0]
+        assert node == "[CIRCULAR_REFERENCE]"
+
+    def test_multiple_self_references_are_marked(self, sensitive_filter):
+        data = {"name": "web"}
+        for key in ("a", "b", "c", "d", "e", "f"):
+            data[key] = data
+
+        filtered = sensitive_filter(data)
+
+        assert filtered["name"] == "web"
+        assert all(filtered[key] == "[CIRCULAR_REFERENCE]" for key in "abcdef")
+
+    def test_deep_nesting_is_cut_off(self, sensitive_filter):
+        data = node = {}
+        for _ in range(5000):
+            node["child"] = {}
+            node = node["child"]
+
+        filtered, sensitive = sensitive_filter.filter_with_flag(data)
+
+        depth = 0
+        while isinstance(filtered, dict):
+            filtered = filtered["child"]
+            depth += 1
+        assert filtered == "[RECURSION_ERROR]"
+        assert depth == MAX_FILTER_DEPTH
+        assert sensitive is True
+
+    def test_key_cache_is_per_instance(self, sensitive_filter):
+        assert sensitive_filter.check_key("password") is True
+        assert SensivityFilter(set(), set(), []).check_key("password") is False
+
+    def test_empty_configuration_flags_nothing(self):
+        empty_filter = SensivityFilter(set(), set(), [])
+
+        assert empty_filter.check_key("password") is False
+        assert empty_filter.check_text("password=secret123") is False
+        assert empty_filter({"password": "secret"}) == {"password": "secret"}
@@ -1,29 +1,12 @@
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from unittest.mock import Mock
 
-from system_logger import SystemLogger
-from messaging import InMemoryMessaging
-from sensivity_filter import SensivityFilter
 from user_activity_logger import UserActivityLogger
 
 
-@pytest.fixture
-def logger():
-    return Mock(spec=SystemLogger)
-
-
-@pytest.fixture
-def messaging(logger):
-    return InMemoryMessaging(logger=logger)
-
-
-@pytest.fixture
-def activity_logger(messaging):
-    return UserActivityLogger(messaging, SensivityFilter())
-
-
 class TestUserActivityLogger:
     @pytest.mark.asyncio
     async def test_container_created(self, activity_logger):
@@ -33,8 +16,7 @@ class TestUserActivityLogger:
 
         await activity_logger.container_created(container_id, name, image)
 
-        event = activity_logger.messaging.published_events[0]
-        payload = event["payload"]
+        payload = activity_logger.messaging.last_by_type["container_created"]
         assert payload["type"] == "container_created"
         assert payload["container_id"] == container_id
         assert "created successfully" in payload["message"]
@@ -46,35 +28,35 @@ class TestUserActivityLogger:
     @pytest.mark.asyncio
     async def test_container_started(self, activity_logger):
         await activity_logger.container_started("cid", "name")
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_started"]
         assert payload["type"] == "container_started"
         assert payload["details"]["status"] == "running"
 
     @pytest.mark.asyncio
     async def test_container_stopped(self, activity_logger):
         await activity_logger.container_stopped("cid", "name")
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_stopped"]
         assert payload["type"] == "container_stopped"
         assert payload["details"]["status"] == "stopped"
 
     @pytest.mark.asyncio
     async def test_container_restarted(self, activity_logger):
         await activity_logger.container_restarted("cid", "name")
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_restarted"]
         assert payload["type"] == "container_restarted"
         assert payload["details"]["status"] == "running"
 
     @pytest.mark.asyncio
     async def test_container_updated(self, activity_logger):
         await activity_logger.container_updated("cid", "name")
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_updated"]
         assert payload["type"] == "container_updated"
         assert payload["details"]["status"] == "updated"
 
     @pytest.mark.asyncio
     async def test_container_deleted(self, activity_logger):
         await activity_logger.container_deleted("cid", "name")
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_deleted"]
         assert payload["type"] == "container_deleted"
         assert payload["details"]["status"] == "deleted"
 
@@ -82,7 +64,7 @@ class TestUserActivityLogger:
     async def test_log_container_message_received(self, activity_logger):
         message_data = {"type": "status", "data": {"health": "ok"}}
         await activity_logger.container_message("cid", message_data, "received")
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_message"]
         assert payload["type"] == "container_message"
         assert "received from container" in payload["message"]
         assert payload["details"]["direction"] == "received"
@@ -91,15 +73,24 @@ class TestUserActivityLogger:
     @pytest.mark.asyncio
     async def test_log_container_message_sent(self, activity_logger):
         await activity_logger.container_message("cid", {"command": "restart"}, "sent")
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_message"]
         assert payload["details"]["direction"] == "sent"
 
+    @pytest.mark.asyncio
+    async def test_container_message_preview_is_truncated(self, activity_logger):
+        message_data = {"type": "status", "data": "x" * 200}
+        await activity_logger.container_message("cid", message_data, "received")
+        preview = activity_logger.messaging.last_by_type["container_message"][
+            "details"
+        ]["message_preview"]
+        assert preview == str(message_data)[:100] + "..."
+
     @pytest.mark.asyncio
     async def test_log_actor_event(self, activity_logger):
         await activity_logger.actor_event(
             "cid", "EmailActor", "email_sent", {"recipient": "user@example.com"}
         )
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["actor_event"]
         assert payload["type"] == "actor_event"
         assert payload["details"]["actor"] == "EmailActor"
         assert payload["details"]["event"] == "email_sent"
@@ -109,8 +100,217 @@ class TestUserActivityLogger:
         await activity_logger.container_error(
             "cid", "Connection timeout", "start_container"
         )
-        payload = activity_logger.messaging.published_events[-1]["payload"]
+        payload = activity_logger.messaging.last_by_type["container_error"]
         assert payload["type"] == "container_error"
         assert payload["details"]["error"] is True
         assert payload["details"]["operation"] == "start_container"
         assert datetime.fromisoformat(payload["timestamp"])
+        assert "timestamp" not in payload["details"]
+
+    @pytest.mark.asyncio
+    async def test_user_activity_filters_details(self, activity_logger):
+        await activity_logger.user_activity(
+            "flow_deployed", "cid", "Flow deployed", {"token": "abc", "flow": "x"}
+        )
+        payload = activity_logger.messaging.last_by_type["flow_deployed"]
+        assert payload["details"] == {"token": "[FILTERED]", "flow": "x"}
+
+        await activity_logger.user_activity("flow_paused", "cid", "Flow paused")
+        payload = activity_logger.messaging.last_by_type["flow_paused"]
+        assert payload["details"] is None
+
+    @pytest.mark.asyncio
+    async def test_dedup_suppresses_repeat(self, activity_logger):
+        await activity_logger.container_started("cid", "name")
+        await activity_logger.container_started("cid", "name")
+
+        assert len(activity_logger.messaging.published_events) == 1
+
+    @pytest.mark.asyncio
+    async def test_dedup_keeps_distinct_transitions(self, activity_logger):
+        await activity_logger.container_started("cid", "name")
+        await activity_logger.container_stopped("cid", "name")
+        await activity_logger.container_started("cid", "name")
+        await activity_logger.container_started("other", "name")
+
+        assert len(activity_logger.messaging.published_events) == 4
+
+    @pytest.mark.asyncio
+    async def test_dedup_compares_unfiltered_data(self, activity_logger):
+        await activity_logger.container_message("cid", {"type": "status", "token": "a"})
+        await activity_logger.container_message("cid", {"type": "status", "token": "b"})
+        await activity_logger.container_message("cid", {"data": "x" * 100 + "1"})
+        await activity_logger.container_message("cid", {"data": "x" * 100 + "2"})
+        await activity_logger.actor_event("cid", "a", "email_sent", {"password": "p1"})
+        await activity_logger.actor_event("cid", "a", "email_sent", {"password": "p2"})
+
+        assert len(activity_logger.messaging.published_events) == 6
+
+    @pytest.mark.asyncio
+    async def test_dedup_disabled_with_zero_window(self, messaging):
+        activity_logger = UserActivityLogger(messaging, dedup_window=0)
+
+        await activity_logger.container_started("cid", "name")
+        await activity_logger.container_started("cid", "name")
+
+        assert len(messaging.published_events) == 2
+
+    @pytest.mark.asyncio
+    async def test_dedup_forgets_stale_containers(self, messaging):
+        activity_logger = UserActivityLogger(messaging, dedup_window=0.01)
+
+        await activity_logger.container_started("cid-1", "name")
+        await activity_logger.container_started("cid-2", "name")
+        await asyncio.sleep(0.02)
+        await activity_logger.container_started("cid-3", "name")
+        await activity_logger.container_started("cid-1", "name")
+        await activity_logger.container_started("cid-3", "name")
+
+        published = [
+            event["payload"]["container_id"] for event in messaging.published_events
+        ]
+        assert published == ["cid-1", "cid-2", "cid-3", "cid-1"]
+
+    @pytest.mark.asyncio
+    async def test_dedup_resets_on_unhashable_event(self, activity_logger):
+        circular = {"type": "status"}
+        circular["self"] = circular
+
+        await activity_logger.container_started("cid", "name")
+        await activity_logger.container_message("cid", circular)
+        await activity_logger.container_started("cid", "name")
+
+        assert len(activity_logger.messaging.published_events) == 3
+
+    @pytest.mark.asyncio
+    async def test_dedup_handles_deeply_nested_data(self, activity_logger):
+        nested = {"type": "status"}
+        for _ in range(2000):
+            nested = {"child": nested}
+
+        await activity_logger.container_message("cid", nested)
+        await activity_logger.container_message("cid", nested)
+
+        assert len(activity_logger.messaging.published_events) == 2
+
+    def test_timestamp_matches_datetime_isoformat(self, activity_logger):
+        before = datetime.now(timezone.utc)
+        timestamp = activity_logger._timestamp()
+        after = datetime.now(timezone.utc)
+
+        parsed = datetime.fromisoformat(timestamp)
+        assert before.replace(microsecond=before.microsecond // 1000 * 1000) <= parsed
+        assert parsed <= after
+        assert timestamp == parsed.isoformat(timespec="milliseconds")
+
+
+class TestUserActivityLoggerBatching:
+    @pytest.mark.asyncio
+    async def test_buffers_until_flush(self, messaging):
+        activity_logger = UserActivityLogger(messaging, batch_size=10)
+
+        await activity_logger.container_started("cid", "name")
+        await activity_logger.container_stopped("cid", "name")
+        assert len(messaging.published_events) == 0
+
+        await activity_logger.flush()
+        assert [e["payload"]["type"] for e in messaging.published_events] == [
+            "container_started",
+            "container_stopped",
+        ]
+        assert all(e["event"] == "activity_log" for e in messaging.published_events)
+        await activity_logger.aclose()
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self, messaging):
+        activity_logger = UserActivityLogger(messaging, batch_size=2)
+
+        await activity_logger.container_started("cid-1", "name")
+        await activity_logger.container_started("cid-2", "name")
+
+        assert len(messaging.published_events) == 2
+        await activity_logger.aclose()
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self, messaging):
+        activity_logger = UserActivityLogger(
+            messaging, batch_size=10, flush_interval=0.01
+        )
+
+        await activity_logger.container_started("cid", "name")
+        await asyncio.sleep(0.05)
+
+        assert len(messaging.published_events) == 1
+        await activity_logger.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_publishes_pending(self, messaging):
+        activity_logger = UserActivityLogger(
+            messaging, batch_size=10, flush_interval=60
+        )
+
+        await activity_logger.container_started("cid", "name")
+        await activity_logger.aclose()
+
+        assert len(messaging.published_events) == 1
+
+    @pytest.mark.asyncio
+    async def test_full_batch_cancels_timer(self, messaging):
+        activity_logger = UserActivityLogger(messaging, batch_size=2, flush_interval=60)
+
+        await activity_logger.container_started("cid-1", "name")
+        assert activity_logger._flush_handle is not None
+        await activity_logger.container_started("cid-2", "name")
+
+        assert activity_logger._flush_handle is None
+        assert len(messaging.published_events) == 2
+        await activity_logger.aclose()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_failure_is_logged(self, messaging):
+        logger = MagicMock()
+        activity_logger = UserActivityLogger(messaging, batch_size=2, logger=logger)
+        messaging.publish_events = AsyncMock(side_effect=ConnectionError("down"))
+
+        await activity_logger.container_started("cid-1", "name")
+        await activity_logger.container_started("cid-2", "name")
+
+        logger.error.assert_called_once()
+        assert logger.error.call_args.args[1]["dropped_events"] == 2
+        await activity_logger.aclose()
+
+    @pytest.mark.asyncio
+    async def test_emits_after_aclose_are_dropped(self, messaging):
+        activity_logger = UserActivityLogger(
+            messaging, batch_size=10, flush_interval=0.01
+        )
+        await activity_logger.aclose()
+
+        await activity_logger.container_started("cid", "name")
+        await asyncio.sleep(0.02)
+
+        assert activity_logger._flush_handle is None
+        assert len(messaging.published_events) == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_emits_share_a_batch(self, messaging):
+        activity_logger = UserActivityLogger(messaging, batch_size=6)
+
+        await asyncio.gather(
+            activity_logger.container_created("cid", "name", "nginx:latest"),
+            activity_logger.container_started("cid", "name"),
+            activity_logger.container_stopped("cid", "name"),
+            activity_logger.container_restarted("cid", "name"),
+            activity_logger.container_updated("cid", "name"),
+            activity_logger.container_deleted("cid", "name"),
+        )
+
+        assert [e["payload"]["type"] for e in messaging.published_events] == [
+            "container_created",
+            "container_started",
+            "container_stopped",
+            "container_restarted",
+            "container_updated",
+            "container_deleted",
+        ]
+        await activity_logger.aclose()
@@ -1,62 +1,178 @@
-from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from sensivity_filter import SensivityFilter
+from system_logger import SystemLogger
+
+ACTIVITY_LOG_EVENT = "activity_log"
+ACTIVITY_LOG_ROUTING_KEY = "event.activity"
+# Events with more nodes than this are never treated as duplicates
+DEDUP_NODE_LIMIT = 256
+
+
+def _repr_chunks(data: Any) -> Iterator[str]:
+    """Yield ``repr(data)`` piece by piece for plain dicts and lists."""
+    if type(data) is dict:
+        yield "{"
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                yield ", "
+            yield repr(key)
+            yield ": "
+            yield from _repr_chunks(value)
+        yield "}"
+    elif type(data) is list:
+        yield "["
+        for index, item in enumerate(data):
+            if index:
+                yield ", "
+            yield from _repr_chunks(item)
+        yield "]"
+    else:
+        yield repr(data)
+
+
+def _preview(data: Any, limit: int = 100) -> str:
+    """
+    Same as truncating ``str(data)`` to ``limit`` characters plus "...", but
+    stops rendering containers as soon as the limit is exceeded.
+    """
+    if type(data) is dict or type(data) is list:
+        parts = []
+        length = 0
+        for chunk in _repr_chunks(data):
+            parts.append(chunk)
+            length += len(chunk)
+            if length > limit:
+                return "".join(parts)[:limit] + "..."
+        return "".join(parts)
+
+    text = str(data)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _fingerprint(data: Any, limit: int = DEDUP_NODE_LIMIT) -> Optional[bytes]:
+    """
+    Hash ``data`` by walking it iteratively, or return None if it has more
+    than ``limit`` nodes or a leaf cannot be represented.
+    """
+    hasher = hashlib.blake2b(digest_size=8)
+    stack = [data]
+    visited = 0
+    while stack:
+        visited += 1
+        if visited > limit:
+            return None
+
+        item = stack.pop()
+        if type(item) is dict:
+            hasher.update(b"{%d" % len(item))
+            for key, value in item.items():
+                stack.append(value)
+                stack.append(key)
+        elif type(item) is list or type(item) is tuple:
+            hasher.update(b"[%d" % len(item))
+            stack.extend(reversed(item))
+        elif type(item) is str:
+            encoded = item.encode("utf-8", "surrogatepass")
+            hasher.update(b"s%d:" % len(encoded))
+            hasher.update(encoded)
+        else:
+            try:
+                text = f"{type(item).__qualname__}:{item!r}"
+            except Exception:
+                return None
+            encoded = text.encode("utf-8", "surrogatepass")
+            hasher.update(b"r%d:" % len(encoded))
+            hasher.update(encoded)
+    return hasher.digest()
 
 
 class UserActivityLogger:
+    _LIFECYCLE_TEMPLATES: Dict[str, Tuple[str, str]] = {
+        "container_created": (
+            "Container '{name}' created successfully",
+            "created",
+        ),
+        "container_started": (
+            "Container '{name}' started and is now running",
+            "running",
+        ),
+        "container_stopped": (
+            "Container '{name}' stopped successfully",
+            "stopped",
+        ),
+        "container_restarted": (
+            "Container '{name}' restarted successfully",
+            "running",
+        ),
+        "container_updated": (
+            "Container '{name}' updated with new code",
+            "updated",
+        ),
+        "container_deleted": (
+            "Container '{name}' deleted and resources cleaned up",
+            "deleted",
+        ),
+    }
+
+    _MESSAGE_TEMPLATES: Dict[str, str] = {
+        "sent": "Message sent to container",
+        "received": "Message received from container",
+    }
+
     def __init__(
-        self, messaging: Any, sensivity_filter: Optional[SensivityFilter] = None
+        self,
+        messaging: Any,
+        sensivity_filter: Optional[SensivityFilter] = None,
+        dedup_window: float = 1.0,
+        dedup_capacity: int = 4096,
+        batch_size: int = 1,
+        flush_interval: float = 0.01,
+        logger: Optional[SystemLogger] = None,
     ):
         self.messaging = messaging
         self.sensivity_filter = sensivity_filter or SensivityFilter()
+        self.logger = logger or SystemLogger("user_activity_logger")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._closed = False
+        self.dedup_window = dedup_window
+        self.dedup_capacity = dedup_capacity
+        self._last_events: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._timestamp_cache: Tuple[int, str] = (-1, "")
+        self._second_prefix: Tuple[int, str] = (-1, "")
 
     async def container_created(
         self, container_id: str, name: str, image: Optional[str] = None
     ) -> None:
-        message = f"Container '{name}' created successfully"
-        details = {"container_id": container_id, "name": name, "status": "created"}
-        if image:
-            details["image"] = image
-
-        await self._emit_activity_log(
-            "container_created", container_id, message, details
+        await self._log_lifecycle(
+            "container_created",
+            container_id,
+            name,
+            **({"image": image} if image else {}),
         )
 
     async def container_started(self, container_id: str, name: str) -> None:
-        message = f"Container '{name}' started and is now running"
-        details = {"container_id": container_id, "name": name, "status": "running"}
-        await self._emit_activity_log(
-            "container_started", container_id, message, details
-        )
+        await self._log_lifecycle("container_started", container_id, name)
 
     async def container_stopped(self, container_id: str, name: str) -> None:
-        message = f"Container '{name}' stopped successfully"
-        details = {"container_id": container_id, "name": name, "status": "stopped"}
-        await self._emit_activity_log(
-            "container_stopped", container_id, message, details
-        )
+        await self._log_lifecycle("container_stopped", container_id, name)
 
     async def container_restarted(self, container_id: str, name: str) -> None:
-        message = f"Container '{name}' restarted successfully"
-        details = {"container_id": container_id, "name": name, "status": "running"}
-        await self._emit_activity_log(
-            "container_restarted", container_id, message, details
-        )
+        await self._log_lifecycle("container_restarted", container_id, name)
 
     async def container_updated(self, container_id: str, name: str) -> None:
-        message = f"Container '{name}' updated with new code"
-        details = {"container_id": container_id, "name": name, "status": "updated"}
-        await self._emit_activity_log(
-            "container_updated", container_id, message, details
-        )
+        await self._log_lifecycle("container_updated", container_id, name)
 
     async def container_deleted(self, container_id: str, name: str) -> None:
-        message = f"Container '{name}' deleted and resources cleaned up"
-        details = {"container_id": container_id, "name": name, "status": "deleted"}
-        await self._emit_activity_log(
-            "container_deleted", container_id, message, details
-        )
+        await self._log_lifecycle("container_deleted", container_id, name)
 
     async def container_message(
         self,
@@ -64,10 +180,13 @@ class UserActivityLogger:
         message_data: Dict[str, Any],
         direction: str = "received",
     ) -> None:
-        filtered_message = self.sensivity_filter(message_data)
+        filtered_message, is_sensitive = self.sensivity_filter.filter_with_flag(
+            message_data
+        )
 
-        action = "sent to" if direction == "sent" else "received from"
-        message = f"Message {action} container"
+        message = self._MESSAGE_TEMPLATES.get(
+            direction, self._MESSAGE_TEMPLATES["received"]
+        )
 
         message_type = "unknown"
         if isinstance(message_data, dict):
@@ -79,18 +198,17 @@ class UserActivityLogger:
             "container_id": container_id,
             "direction": direction,
             "message_type": message_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
-        if not self.sensivity_filter.check_data(message_data):
-            details["message_preview"] = (
-                str(filtered_message)[:100] + "..."
-                if len(str(filtered_message)) > 100
-                else str(filtered_message)
-            )
+        if not is_sensitive:
+            details["message_preview"] = _preview(filtered_message)
 
         await self._emit_activity_log(
-            "container_message", container_id, message, details
+            "container_message",
+            container_id,
+            message,
+            details,
+            raw_data=(direction, message_data),
         )
 
     async def actor_event(
@@ -105,13 +223,14 @@ class UserActivityLogger:
             "container_id": container_id,
             "actor": actor,
             "event": event,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
         if event_data:
             details["event_data"] = self.sensivity_filter(event_data)
 
-        await self._emit_activity_log("actor_event", container_id, message, details)
+        await self._emit_activity_log(
+            "actor_event", container_id, message, details, raw_data=event_data
+        )
 
     async def container_error(
         self, container_id: str, error_message: str, operation: Optional[str] = None
@@ -125,7 +244,6 @@ class UserActivityLogger:
             "container_id": container_id,
             "error": True,
             "operation": operation,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
         await self._emit_activity_log("container_error", container_id, message, details)
@@ -137,8 +255,22 @@ class UserActivityLogger:
         message: str,
         details: Optional[Dict[str, Any]] = None,
     ) -> None:
+        raw_details = details
+        if details:
+            details = self.sensivity_filter(details)
+
+        await self._emit_activity_log(
+            activity_type, container_id, message, details, raw_data=raw_details
+        )
+
+    async def _log_lifecycle(
+        self, activity_type: str, container_id: str, name: str, **extra: Any
+    ) -> None:
+        template, status = self._LIFECYCLE_TEMPLATES[activity_type]
+        details = {"container_id": container_id, "name": name, "status": status}
+        details.update(extra)
         await self._emit_activity_log(
-            activity_type, container_id, message, self.sensivity_filter(details)
+            activity_type, container_id, template.format(name=name), details
         )
 
     async def _emit_activity_log(
@@ -147,15 +279,157 @@ class UserActivityLogger:
         container_id: str,
         message: str,
         details: Dict[str, Any],
+        raw_data: Any = None,
     ) -> None:
-        await self.messaging.publish_event(
-            "activity_log",
-            {
-                "type": activity_type,
-                "container_id": container_id,
-                "message": message,
-                "details": details,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            },
-            routing_key="event.activity",
+        if self._closed:
+            self.logger.debug(
+                "Activity log emitted after close, dropping it",
+                {"type": activity_type, "container_id": container_id},
+            )
+            return
+
+        # Duplicates are detected on the unfiltered data: redaction and preview
+        # truncation can make distinct events look identical
+        if self._is_duplicate(
+            activity_type,
+            container_id,
+            message,
+            details if raw_data is None else raw_data,
+        ):
+            return
+
+        activity_log = {
+            "type": activity_type,
+            "container_id": container_id,
+            "message": message,
+            "details": details,
+            "timestamp": self._timestamp(),
+        }
+
+        if self.batch_size <= 1:
+            await self.messaging.publish_event(
+                ACTIVITY_LOG_EVENT,
+                activity_log,
+                routing_key=ACTIVITY_LOG_ROUTING_KEY,
+            )
+            return
+
+        self._pending.append(activity_log)
+        if len(self._pending) >= self.batch_size:
+            # A full batch makes the timer redundant; publish failures are
+            # logged rather than raised into whichever caller filled it
+            self._cancel_flush_timer()
+            await self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._schedule_flush
+            )
+
+    async def flush(self) -> None:
+        """Publish all buffered activity logs in a single batch."""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        await self.messaging.publish_events(
+            ACTIVITY_LOG_EVENT, pending, routing_key=ACTIVITY_LOG_ROUTING_KEY
         )
+
+    async def aclose(self) -> None:
+        """
+        Cancel the pending flush timer and publish what is still buffered.
+
+        Activity logs emitted afterwards are dropped.
+        """
+        self._closed = True
+        self._cancel_flush_timer()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _schedule_flush(self) -> None:
+        self._flush_handle = None
+        task = asyncio.create_task(self._flush_pending())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_pending(self) -> None:
+        count = len(self._pending)
+        try:
+            await self.flush()
+        except Exception as exc:
+            self.logger.error(
+                exc, {"operation": "flush_activity_logs", "dropped_events": count}
+            )
+
+    def _timestamp(self) -> str:
+        """Current UTC time in ISO format, reused within the same millisecond."""
+        now_ms = time.time_ns() // 1_000_000
+        cached_ms, timestamp = self._timestamp_cache
+        if now_ms == cached_ms:
+            return timestamp
+
+        # Only the milliseconds change within a second, so reuse the formatted
+        # date and time up to the seconds
+        seconds, millis = divmod(now_ms, 1000)
+        cached_seconds, prefix = self._second_prefix
+        if seconds != cached_seconds:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+            self._second_prefix = (seconds, prefix)
+
+        timestamp = f"{prefix}.{millis:03d}+00:00"
+        self._timestamp_cache = (now_ms, timestamp)
+        return timestamp
+
+    def _is_duplicate(
+        self,
+        activity_type: str,
+        container_id: str,
+        message: str,
+        data: Any,
+    ) -> bool:
+        """
+        Check whether an event repeats the previous event of the same container.
+
+        Repeats are suppressed only while they arrive within ``dedup_window``
+        seconds of the last emitted event, so legitimate periodic events
+        (e.g. recurring health warnings) are still delivered. A window of ``0``
+        disables suppression.
+        """
+        if self.dedup_window <= 0:
+            return False
+
+        now = time.monotonic()
+        self._evict_stale_events(now)
+
+        key = _fingerprint((activity_type, message, data))
+        if key is None:
+            # Large, deep or circular data is never suppressed, and the event
+            # still replaces the container's previous one
+            self._last_events.pop(container_id, None)
+            return False
+
+        last = self._last_events.get(container_id)
+        # Entries older than the window were evicted above
+        if last is not None and last[0] == key:
+            return True
+
+        self._last_events[container_id] = (key, now)
+        self._last_events.move_to_end(container_id)
+        if len(self._last_events) > self.dedup_capacity:
+            self._last_events.popitem(last=False)
+        return False
+
+    def _evict_stale_events(self, now: float) -> None:
+        # Entries are moved to the end whenever they are refreshed, so they
+        # stay ordered by time and the stale ones sit in front
+        while self._last_events:
+            oldest = next(iter(self._last_events.values()))
+            if now - oldest[1] < self.dedup_window:
+                break
+            self._last_events.popitem(last=False)
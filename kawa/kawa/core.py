@@ -8,6 +8,8 @@ from typing import (
     Union,
     final,
 )
+from uuid import UUID
+from weakref import WeakKeyDictionary, ref
 
 from .utils import (
     get_actor_uuid,
@@ -18,22 +20,60 @@ from .utils import (
 
 @final
 class NotSupportedEvent:
+    __slots__ = ("event",)
+
     def __init__(self, event: object):
         self.event = event
 
 
 @final
 class Context:
+    __slots__ = ()
+
     def dispatch(self, event: object):
         pass
 
 
+def _normalize_doc(doc: Optional[str]) -> str:
+    if not doc:
+        return ""
+    # Without an indented line untab_string() has nothing to remove
+    if doc[0] not in " \t" and "\n " not in doc and "\n\t" not in doc:
+        return doc.strip()
+    return untab_string(doc).strip()
+
+
+EventMetadata = tuple[UUID, str, str]
+_event_metadata_cache: WeakKeyDictionary[type, tuple[Optional[str], EventMetadata]] = (
+    WeakKeyDictionary()
+)
+
+
+def _event_metadata(eventClass: type[object]) -> EventMetadata:
+    doc = eventClass.__doc__
+    cached = _event_metadata_cache.get(eventClass)
+    # The doc is checked because @event applies dataclass() after registering,
+    # which fills in a generated __doc__ on the same class
+    if cached is not None and cached[0] == doc:
+        return cached[1]
+
+    metadata = (
+        get_event_uuid(eventClass),
+        eventClass.__name__,
+        _normalize_doc(doc),
+    )
+    _event_metadata_cache[eventClass] = (doc, metadata)
+    return metadata
+
+
 EventFilterT = TypeVar("EventFilterT", bound=object)
 EventFilterContext = dict[str, str]
 
 
 @final
 class EventFilter(Generic[EventFilterT]):
+    __slots__ = ("event_class", "context", "filter_function")
+
     def __init__(
         self,
         event_class: type[EventFilterT],
@@ -44,7 +84,10 @@ class EventFilter(Generic[EventFilterT]):
         self.context = context
         self.filter_function = filter_function
 
-    def __call__(self, event: EventFilterT) -> bool:
+    def __call__(self, event: object) -> bool:
+        # Events of another class never reach the user-supplied predicate
+        if not isinstance(event, self.event_class):
+            return False
         return self.filter_function(event)
 
 
@@ -53,6 +96,16 @@ EventClassOrFilter = Union[type[object], type[EventFilter]]
 
 @final
 class ActorReceiveEventDefinition:
+    __slots__ = (
+        "id",
+        "name",
+        "doc",
+        "ctx",
+        "eventClass",
+        "eventClassOrFilter",
+        "__weakref__",
+    )
+
     def __init__(self, eventClassOrFilter: EventClassOrFilter):
         if isinstance(eventClassOrFilter, EventFilter):
             eventClass = eventClassOrFilter.event_class
@@ -61,14 +114,7 @@ class ActorReceiveEventDefinition:
             eventClass = eventClassOrFilter
             ctx = {}
 
-        doc = eventClass.__doc__
-        if doc is None:
-            doc = ""
-        doc = untab_string(doc).strip()
-
-        self.id = get_event_uuid(eventClass)
-        self.name = eventClass.__name__
-        self.doc = doc
+        self.id, self.name, self.doc = _event_metadata(eventClass)
         self.ctx = ctx
         self.eventClass = eventClass
         self.eventClassOrFilter = eventClassOrFilter
@@ -76,17 +122,14 @@ class ActorReceiveEventDefinition:
 
 @final
 class ActorSendEventDefinition:
+    __slots__ = ("id", "name", "doc", "eventClass", "__weakref__")
+
     def __init__(self, eventClass: type[object]):
-        doc = eventClass.__doc__
-        if doc is None:
-            doc = ""
-        doc = untab_string(doc).strip()
+        self.id, self.name, doc = _event_metadata(eventClass)
 
         if doc == f"{eventClass.__name__}()":
             doc = ""
 
-        self.id = get_event_uuid(eventClass)
-        self.name = eventClass.__name__
         self.doc = doc
         self.eventClass = eventClass
 
@@ -99,8 +142,57 @@ class ActorClass(Protocol):
 ActorFuncOrClass = Union[Callable[[Context, object], None], ActorClass]
 
 
+# Definitions for plain event classes are shared by every actor that receives
+# or sends the class; they are rebuilt if the class metadata has changed since.
+# A definition references its class, so the caches hold it weakly too, or the
+# class could never be collected
+_receive_definitions: WeakKeyDictionary[
+    type, tuple[EventMetadata, ref[ActorReceiveEventDefinition]]
+] = WeakKeyDictionary()
+_send_definitions: WeakKeyDictionary[
+    type, tuple[EventMetadata, ref[ActorSendEventDefinition]]
+] = WeakKeyDictionary()
+
+
+def _receive_definition(
+    eventClassOrFilter: EventClassOrFilter,
+) -> ActorReceiveEventDefinition:
+    if isinstance(eventClassOrFilter, EventFilter):
+        return ActorReceiveEventDefinition(eventClassOrFilter)
+
+    metadata = _event_metadata(eventClassOrFilter)
+    cached = _receive_definitions.get(eventClassOrFilter)
+    definition = cached[1]() if cached is not None and cached[0] is metadata else None
+    if definition is None:
+        definition = ActorReceiveEventDefinition(eventClassOrFilter)
+        _receive_definitions[eventClassOrFilter] = (metadata, ref(definition))
+    return definition
+
+
+def _send_definition(eventClass: type[object]) -> ActorSendEventDefinition:
+    metadata = _event_metadata(eventClass)
+    cached = _send_definitions.get(eventClass)
+    definition = cached[1]() if cached is not None and cached[0] is metadata else None
+    if definition is None:
+        definition = ActorSendEventDefinition(eventClass)
+        _send_definitions[eventClass] = (metadata, ref(definition))
+    return definition
+
+
 @final
 class ActorDefinition:
+    __slots__ = (
+        "id",
+        "name",
+        "doc",
+        "actorFuncOrClass",
+        "receivs",
+        "sends",
+        "min_instances",
+        "max_instances",
+        "keep_instance",
+    )
+
     def __init__(
         self,
         actorFuncOrClass: ActorFuncOrClass,
@@ -115,16 +207,15 @@ class ActorDefinition:
             self.name = actorFuncOrClass.__class__.__name__
         else:
             self.name = actorFuncOrClass.__name__
-        self.doc = untab_string(actorFuncOrClass.__doc__ or "").strip()
+        self.doc = _normalize_doc(actorFuncOrClass.__doc__)
         self.actorFuncOrClass = actorFuncOrClass
-        self.receivs = [
-            ActorReceiveEventDefinition(receive)
+        self.receivs = tuple(
+            _receive_definition(receive)
             for receive in (receivs if receivs is not None else tuple())
-        ]
-        self.sends = [
-            ActorSendEventDefinition(send)
-            for send in (sends if sends is not None else tuple())
-        ]
+        )
+        self.sends = tuple(
+            _send_definition(send) for send in (sends if sends is not None else tuple())
+        )
         self.min_instances = min_instances
         self.max_instances = max_instances
         self.keep_instance = keep_instance
@@ -132,13 +223,8 @@ class ActorDefinition:
 
 @final
 class EventDefinition:
-    def __init__(self, eventClass: type[object]):
-        doc = eventClass.__doc__
-        if doc is None:
-            doc = ""
-        doc = untab_string(doc).strip()
+    __slots__ = ("id", "name", "doc", "eventClass")
 
-        self.id = get_event_uuid(eventClass)
-        self.name = eventClass.__name__
-        self.doc = doc
+    def __init__(self, eventClass: type[object]):
+        self.id, self.name, self.doc = _event_metadata(eventClass)
         self.eventClass = eventClass
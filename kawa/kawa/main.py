@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, Union
 from dataclasses import dataclass
 
 from .core import ActorDefinition, EventDefinition, EventClassOrFilter, ActorFuncOrClass
@@ -14,18 +14,28 @@ def event(cls):
     return dataclass(cls)
 
 
+def _as_tuple(value) -> tuple:
+    if value is None:
+        return ()
+    if isinstance(value, tuple):
+        return value
+    if isinstance(value, list):
+        return tuple(value)
+    # A set's order is arbitrary and would make the dump order vary between runs
+    if isinstance(value, (set, frozenset)):
+        raise TypeError("receivs and sends must be a class, a tuple or a list")
+    return (value,)
+
+
 def actor(
     receivs: Optional[Union[tuple[EventClassOrFilter, ...], EventClassOrFilter]] = None,
-    sends: Optional[Union[tuple[type[object], ...], type[object]] = None,
+    sends: Optional[Union[tuple[type[object], ...], type[object]]] = None,
     min_instances: Optional[int] = None,
     max_instances: Optional[int] = None,
     keep_instance: Optional[timedelta] = None,
 ):
-    if not isinstance(receivs, tuple):
-        receivs = (receivs,)
-
-    if not isinstance(sends, tuple):
-        sends = (sends,)
+    receivs = _as_tuple(receivs)
+    sends = _as_tuple(sends)
 
     def decorator(actorFuncOrClass: ActorFuncOrClass):
         registry.register_actor(
@@ -1,22 +1,30 @@
 from .core import ActorDefinition, EventDefinition
+from .utils import json_encode
 
 
 class Registry:
     def __init__(self):
         self.actors = {}
         self.events = {}
+        self._event_dumps = []
+        self._actor_dumps = []
+        self._dump_bytes = None
 
     def register_event(self, event_def: EventDefinition):
         if event_def.id in self.events:
             return
 
         self.events[event_def.id] = event_def
+        self._event_dumps.append(self._dump_event(event_def))
+        self._dump_bytes = None
 
     def register_actor(self, actor_def: ActorDefinition):
         if actor_def.id in self.actors:
             return
 
         self.actors[actor_def.id] = actor_def
+        self._actor_dumps.append(self._dump_actor(actor_def))
+        self._dump_bytes = None
 
     def _dump_event(self, event: EventDefinition):
         return {
@@ -49,7 +57,13 @@ class Registry:
         }
 
     def dump(self):
-        return {
-            "events": [self._dump_event(x) for x in self.events.values()],
-            "actors": [self._dump_actor(x) for x in self.actors.values()],
-        }
+        # Definitions never change after registration, so each one is dumped
+        # once when it is registered. The lists are copied so callers cannot
+        # change the registry or leave dump_bytes() stale
+        return {"events": list(self._event_dumps), "actors": list(self._actor_dumps)}
+
+    def dump_bytes(self) -> bytes:
+        """Encoded ``dump()``, reused until another definition is registered."""
+        if self._dump_bytes is None:
+            self._dump_bytes = json_encode(self.dump()).encode()
+        return self._dump_bytes
@@ -1,33 +1,81 @@
-import socket
+import asyncio
+import contextlib
 import os
 
 from kawa import registry
-from kawa.utils import json_encode
+from kawa.utils import json_decode, json_encode
 
 SOCKET_PATH = os.environ.get("SOCKET_PATH", "/var/run/kawaflow.sock")
 
+# Frames are a 4-byte big-endian length followed by a UTF-8 JSON body, the
+# same framing flow-manager's SocketCommunicationHandler uses
+HEADER_SIZE = 4
+# Larger frames are rejected before they are read, so a client that is not
+# speaking the framed protocol cannot make the server buffer gigabytes
+MAX_FRAME_SIZE = 1 << 20
+
 
 def handle_command(command: str):
     if command == "dump":
         return registry.dump()
+    if command == "ping":
+        return {"status": "ok"}
     return {"error": "unknown command"}
 
 
+def handle_request(body: bytes) -> bytes:
+    try:
+        request = json_decode(body.decode())
+    except ValueError:
+        request = None
+
+    if not isinstance(request, dict):
+        return json_encode({"error": "invalid request"}).encode()
+
+    command = request.get("command", "")
+    if command == "dump":
+        return registry.dump_bytes()
+    return json_encode(handle_command(command)).encode()
+
+
+def write_frame(writer: asyncio.StreamWriter, body: bytes):
+    # writelines() hands header and body to a single sendmsg() call without
+    # concatenating them first
+    writer.writelines((len(body).to_bytes(HEADER_SIZE, "big"), body))
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            header = await reader.readexactly(HEADER_SIZE)
+            size = int.from_bytes(header, "big")
+            if size > MAX_FRAME_SIZE:
+                write_frame(
+                    writer, json_encode({"error": "request too large"}).encode()
+                )
+                await writer.drain()
+                break
+
+            body = await reader.readexactly(size)
+            write_frame(writer, handle_request(body))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+async def serve_async(path: str = SOCKET_PATH):
+    if os.path.exists(path):
+        os.remove(path)
+
+    server = await asyncio.start_unix_server(handle_connection, path=path)
+    print(f"Listening on {path}")
+    async with server:
+        await server.serve_forever()
+
+
 def serve():
-    if os.path.exists(SOCKET_PATH):
-        os.remove(SOCKET_PATH)
-
-    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
-        server.bind(SOCKET_PATH)
-        server.listen()
-        print(f"Listening on {SOCKET_PATH}")
-        conn, addr = server.accept()
-        with conn:
-            print(f"Connected by {addr}")
-            while True:
-                data = conn.recv(1024)
-                if not data:
-                    break
-                command = data.decode().strip()
-                response = handle_command(command)
-                conn.sendall(json_encode(response).encode())
+    asyncio.run(serve_async())
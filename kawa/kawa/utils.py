@@ -4,13 +4,15 @@ from datetime import timedelta
 from sys import modules
 from typing import Protocol, Any
 from uuid import NAMESPACE_DNS, UUID, uuid5
+from weakref import WeakKeyDictionary
 
 actors_namespace = uuid5(NAMESPACE_DNS, "actors")
 events_namespace = uuid5(NAMESPACE_DNS, "events")
+_indent_pattern = re.compile(r"^(?: {2}| {4}|\t)+", re.MULTILINE)
 
 
 def untab_string(s: str) -> str:
-    return re.sub(r"^(?: {2}| {4}|\t)+", "", s, flags=re.MULTILINE)
+    return _indent_pattern.sub("", s) if s else s
 
 
 class HasName(Protocol):
@@ -27,25 +29,49 @@ def get_object_key(obj: HasName) -> str:
     return f"{file_path}::{obj.__name__}"
 
 
+_actor_uuids: WeakKeyDictionary[Any, UUID] = WeakKeyDictionary()
+_event_uuids: WeakKeyDictionary[Any, UUID] = WeakKeyDictionary()
+
+
+def _cached_uuid(
+    cache: WeakKeyDictionary[Any, UUID], namespace: UUID, obj: HasName
+) -> UUID:
+    try:
+        return cache[obj]
+    except KeyError:
+        uuid = cache[obj] = uuid5(namespace, get_object_key(obj))
+        return uuid
+    except TypeError:
+        # Unhashable or not weak-referenceable, e.g. some actor instances
+        return uuid5(namespace, get_object_key(obj))
+
+
 def get_actor_uuid(obj: HasName) -> UUID:
-    return uuid5(actors_namespace, get_object_key(obj))
+    return _cached_uuid(_actor_uuids, actors_namespace, obj)
 
 
 def get_event_uuid(obj: HasName) -> UUID:
-    return uuid5(events_namespace, get_object_key(obj))
+    return _cached_uuid(_event_uuids, events_namespace, obj)
 
 
 class TimedeltaEncoder(json.JSONEncoder):
     def default(self, obj: Any):
-        if isinstance(obj, timedelta):
-            return int(obj.total_seconds())
-        elif isinstance(obj, UUID):
+        # UUIDs are by far the most common non-JSON value in registry dumps
+        if isinstance(obj, UUID):
             return str(obj)
+        elif isinstance(obj, timedelta):
+            return int(obj.total_seconds())
         return super().default(obj)
 
 
-def json_encode(obj):
-    return json.dumps(obj, indent=4, cls=TimedeltaEncoder)
+_compact_encoder = TimedeltaEncoder(separators=(",", ":"))
+_pretty_encoder = TimedeltaEncoder(indent=4)
+
+
+def json_encode(obj, pretty: bool = False):
+    # Everything kawa encodes goes over the socket to flow-manager, so output
+    # is compact unless a caller asks for indentation
+    return (_pretty_encoder if pretty else _compact_encoder).encode(obj)
 
 
 def json_decode(s: str):
@@ -1,6 +1,10 @@
+import gc
+import weakref
 from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from kawa.core import (
     Context,
     EventFilter,
@@ -9,8 +13,10 @@ from kawa.core import (
     ActorDefinition,
     EventDefinition,
     NotSupportedEvent,
+    _normalize_doc,
 )
 from kawa.main import actor, event
+from kawa.registry import Registry
 
 
 @event
@@ -60,6 +66,13 @@ def test_event_filter():
     filter_func.assert_called_once_with(event)
 
 
+def test_event_filter_skips_other_event_classes():
+    filter_func = MagicMock(return_value=True)
+    event_filter = EventFilter(MyEvent, {}, filter_func)
+    assert not event_filter(AnotherEvent())
+    filter_func.assert_not_called()
+
+
 def test_actor_receive_event_definition():
     definition = ActorReceiveEventDefinition(MyEvent)
     assert definition.name == "MyEvent"
@@ -106,3 +119,90 @@ def test_event_definition():
     definition = EventDefinition(MyEvent)
     assert definition.name == "MyEvent"
     assert definition.doc == "This is a test event."
+
+
+def test_event_definition_does_not_keep_class_alive():
+    class TemporaryEvent:
+        """Short-lived event."""
+
+    definition = EventDefinition(TemporaryEvent)
+    assert EventDefinition(TemporaryEvent).id == definition.id
+
+    ref = weakref.ref(TemporaryEvent)
+    del TemporaryEvent, definition
+    gc.collect()
+    assert ref() is None
+
+
+def test_actor_definition_does_not_keep_event_class_alive():
+    class TemporaryEvent:
+        """Short-lived event."""
+
+    def temporary_actor(ctx, event):
+        pass
+
+    definition = ActorDefinition(
+        temporary_actor, receivs=(TemporaryEvent,), sends=(TemporaryEvent,)
+    )
+    assert definition.receivs[0].eventClass is TemporaryEvent
+
+    ref = weakref.ref(TemporaryEvent)
+    del TemporaryEvent, definition
+    gc.collect()
+    assert ref() is None
+
+
+def test_actors_share_event_definitions():
+    def first_actor(ctx, event):
+        pass
+
+    def second_actor(ctx, event):
+        pass
+
+    first = ActorDefinition(first_actor, receivs=(MyEvent,), sends=(AnotherEvent,))
+    second = ActorDefinition(second_actor, receivs=(MyEvent,), sends=(AnotherEvent,))
+
+    assert isinstance(first.receivs, tuple)
+    assert first.receivs[0] is second.receivs[0]
+    assert first.sends[0] is second.sends[0]
+
+
+def test_actor_decorator_normalizes_events(monkeypatch):
+    registry = Registry()
+    monkeypatch.setattr("kawa.main.registry", registry)
+
+    @actor(receivs=[MyEvent], sends=AnotherEvent)
+    def list_actor(ctx: Context, event: MyEvent):
+        pass
+
+    @actor()
+    def idle_actor(ctx: Context, event: MyEvent):
+        pass
+
+    definitions = {
+        definition.actorFuncOrClass: definition
+        for definition in registry.actors.values()
+    }
+    assert [r.eventClass for r in definitions[list_actor].receivs] == [MyEvent]
+    assert [s.eventClass for s in definitions[list_actor].sends] == [AnotherEvent]
+    assert definitions[idle_actor].receivs == ()
+    assert definitions[idle_actor].sends == ()
+
+
+def test_runtime_objects_have_no_instance_dict():
+    event_filter = EventFilter(MyEvent, {}, lambda event: True)
+    for obj in (Context(), NotSupportedEvent(MyEvent()), event_filter):
+        assert not hasattr(obj, "__dict__")
+
+
+def test_normalize_doc():
+    assert _normalize_doc(None) == ""
+    assert _normalize_doc("Single line doc. ") == "Single line doc."
+    assert _normalize_doc("\n    First line.\n    Second line.\n") == (
+        "First line.\nSecond line."
+    )
+
+
+def test_actor_decorator_rejects_sets():
+    with pytest.raises(TypeError):
+        actor(receivs={MyEvent})
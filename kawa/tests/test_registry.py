@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import MagicMock
 
@@ -5,7 +6,7 @@ from kawa.core import ActorDefinition, EventDefinition
 from kawa.registry import Registry
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_event_definition():
     event_def = MagicMock(spec=EventDefinition)
     event_def.id = "event1"
@@ -14,7 +15,7 @@ def mock_event_definition():
     return event_def
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_actor_definition():
     actor_def = MagicMock(spec=ActorDefinition)
     actor_def.id = "actor1"
@@ -83,3 +84,38 @@ def test_dump(mock_event_definition, mock_actor_definition):
     dump = registry.dump()
     assert len(dump["events"]) == 1
     assert len(dump["actors"]) == 1
+
+
+def test_dump_is_built_at_registration(mock_event_definition, mock_actor_definition):
+    registry = Registry()
+    registry.register_event(mock_event_definition)
+    registry.register_event(mock_event_definition)
+    assert registry.dump()["events"] == [registry._dump_event(mock_event_definition)]
+    assert registry.dump()["actors"] == []
+
+    registry.register_actor(mock_actor_definition)
+    assert registry.dump()["actors"] == [registry._dump_actor(mock_actor_definition)]
+
+
+def test_dump_cannot_modify_registry(mock_event_definition):
+    registry = Registry()
+    registry.register_event(mock_event_definition)
+    dump_bytes = registry.dump_bytes()
+
+    registry.dump()["events"].clear()
+
+    assert len(registry.dump()["events"]) == 1
+    assert registry.dump_bytes() == dump_bytes
+
+
+def test_dump_bytes_is_reused_until_registration(
+    mock_event_definition, mock_actor_definition
+):
+    registry = Registry()
+    registry.register_event(mock_event_definition)
+    dump_bytes = registry.dump_bytes()
+    assert registry.dump_bytes() is dump_bytes
+    assert json.loads(dump_bytes)["events"][0]["id"] == mock_event_definition.id
+
+    registry.register_actor(mock_actor_definition)
+    assert len(json.loads(registry.dump_bytes())["actors"]) == 1
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from kawa.serve import HEADER_SIZE, MAX_FRAME_SIZE, handle_connection
+
+
+async def _request(path, body: bytes):
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(len(body).to_bytes(HEADER_SIZE, "big") + body)
+    await writer.drain()
+    header = await reader.readexactly(HEADER_SIZE)
+    response = await reader.readexactly(int.from_bytes(header, "big"))
+    writer.close()
+    await writer.wait_closed()
+    return json.loads(response)
+
+
+def _roundtrip(tmp_path, *bodies: bytes):
+    path = str(tmp_path / "kawa.sock")
+
+    async def run():
+        server = await asyncio.start_unix_server(handle_connection, path=path)
+        async with server:
+            return await asyncio.gather(*(_request(path, body) for body in bodies))
+
+    return asyncio.run(run())
+
+
+def test_dump_command(tmp_path):
+    (response,) = _roundtrip(tmp_path, b'{"command": "dump", "data": {}}')
+    assert set(response) == {"events", "actors"}
+
+
+def test_unknown_command(tmp_path):
+    (response,) = _roundtrip(tmp_path, b'{"command": "restart"}')
+    assert response == {"error": "unknown command"}
+
+
+def test_invalid_request(tmp_path):
+    responses = _roundtrip(tmp_path, b"dump", b'["dump"]')
+    assert responses == [{"error": "invalid request"}] * 2
+
+
+def test_concurrent_clients(tmp_path):
+    responses = _roundtrip(tmp_path, *[b'{"command": "dump"}'] * 5)
+    assert all(set(response) == {"events", "actors"} for response in responses)
+
+
+def test_ping_command(tmp_path):
+    (response,) = _roundtrip(tmp_path, b'{"command": "ping", "data": {}}')
+    assert response == {"status": "ok"}
+
+
+def test_oversized_frame_is_rejected(tmp_path):
+    path = str(tmp_path / "kawa.sock")
+
+    async def run():
+        server = await asyncio.start_unix_server(handle_connection, path=path)
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+            # An unframed client: '{"co' read as a length is about 2 GB
+            writer.write(b'{"command": "dump"}\n')
+            await writer.drain()
+            header = await reader.readexactly(HEADER_SIZE)
+            response = await reader.readexactly(int.from_bytes(header, "big"))
+            closed = await reader.read() == b""
+            writer.close()
+            await writer.wait_closed()
+            return json.loads(response), closed
+
+    response, closed = asyncio.run(run())
+    assert int.from_bytes(b'{"co', "big") > MAX_FRAME_SIZE
+    assert response == {"error": "request too large"}
+    assert closed
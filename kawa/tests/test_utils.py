@@ -1,3 +1,4 @@
+import json
 from datetime import timedelta
 from uuid import UUID
 
@@ -68,3 +69,29 @@ def test_json_encode_decode():
     assert decoded["delta"] == 60
     assert decoded["uuid"] == "12345678-1234-5678-1234-567812345678"
     assert decoded["other"] == "value"
+
+
+def test_uuids_are_cached_per_object():
+    class MyEvent:
+        pass
+
+    assert get_event_uuid(MyEvent) is get_event_uuid(MyEvent)
+    assert get_actor_uuid(MyEvent) != get_event_uuid(MyEvent)
+
+
+def test_uuid_of_unhashable_actor():
+    class MyActor:
+        __hash__ = None
+
+        def __call__(self, ctx, event):
+            pass
+
+    assert get_actor_uuid(MyActor()) == get_actor_uuid(MyActor())
+
+
+def test_json_encode_is_compact_unless_pretty():
+    data = {"delta": timedelta(seconds=5), "items": [1, 2]}
+    assert json_encode(data) == '{"delta":5,"items":[1,2]}'
+    assert json_encode(data, pretty=True) == json.dumps(
+        {"delta": 5, "items": [1, 2]}, indent=4
+    )